@@ -3,7 +3,7 @@ import os
 from pathlib import Path
 from typing import List, Dict, Optional, Any, Literal, Tuple
 
-from openai import OpenAI, AuthenticationError, RateLimitError, Stream
+from openai import AsyncOpenAI, AuthenticationError, RateLimitError, AsyncStream
 
 from loguru import logger
 from openai.types.chat import ChatCompletion, ChatCompletionChunk
@@ -49,7 +49,7 @@ class OpenAIClient:
         if not self.config.api_key:
             raise ValueError("Missing OpenAI API key.")
 
-        self.client = OpenAI(api_key=self.config.api_key)
+        self.client = AsyncOpenAI(api_key=self.config.api_key)
         self.tavily_api_key = tavily_api_key
         self.tavily_manager = None
         if tavily_api_key:
@@ -74,7 +74,7 @@ class OpenAIClient:
             effective_temperature = params["temperature"]
             effective_max_tokens = params["max_tokens"]
 
-            completion = self._execute_completion(params)
+            completion = await self._execute_completion(params)
 
             if not completion.choices:
                 error = NoChoicesError("No choices returned from OpenAI API")
@@ -123,7 +123,7 @@ class OpenAIClient:
         except Exception as e:
             return self._handle_api_error(e)
 
-    def transcribe_audio(self, audio_file_path: str) -> TranscriptionResult:
+    async def transcribe_audio(self, audio_file_path: str) -> TranscriptionResult:
         try:
             logger.info(f"Transcribing audio file: {audio_file_path}")
 
@@ -143,7 +143,7 @@ class OpenAIClient:
                 return TranscriptionResult.fail(error=error)
 
             with open(audio_file_path, "rb") as audio_file:
-                transcription = self.client.audio.transcriptions.create(
+                transcription = await self.client.audio.transcriptions.create(
                     model=OpenAIModels.DEFAULT_TRANSCRIPTION_MODEL, file=audio_file
                 )
 
@@ -169,7 +169,7 @@ class OpenAIClient:
             logger.error(f"Unexpected error during transcription: {str(e)}")
             return TranscriptionResult.fail(error=error)
 
-    def generate_image(
+    async def generate_image(
         self,
         prompt: str,
         size: Literal[
@@ -187,7 +187,7 @@ class OpenAIClient:
                 logger.error(str(error))
                 return ImageGenerationResult.fail(error=error)
 
-            response = self.client.images.generate(
+            response = await self.client.images.generate(
                 prompt=prompt,
                 size=size,
                 quality=quality,
@@ -302,11 +302,11 @@ class OpenAIClient:
 
         return params
 
-    def _execute_completion(
+    async def _execute_completion(
         self, params: Dict[str, Any]
-    ) -> ChatCompletion | Stream[ChatCompletionChunk]:
+    ) -> ChatCompletion | AsyncStream[ChatCompletionChunk]:
         logger.info(f"Sending request to OpenAI {params['model']} model.")
-        return self.client.chat.completions.create(**params)
+        return await self.client.chat.completions.create(**params)
 
     async def _process_tool_calls(
         self,
@@ -373,7 +373,7 @@ class OpenAIClient:
             "max_tokens": max_tokens,
         }
 
-        second_completion = self._execute_completion(params)
+        second_completion = await self._execute_completion(params)
 
         if not second_completion.choices:
             raise NoChoicesError("No choices returned from second OpenAI API call")
@@ -1,10 +1,11 @@
 # src/clients/telegram_bot.py
-import asyncio
 import base64
 import json
 import os
+from collections import deque
 from io import BytesIO
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Deque, Dict, Optional
 
 import aiohttp
 from loguru import logger
@@ -33,6 +34,24 @@ from database.connection import Database
 from database.repository import ConversationRepository
 from utils.token_manager import TokenManager
 
+# Shared, immutable system prompt - reused for every first-time chat instead of
+# materializing a fresh dict per conversation.
+_SYSTEM_MSG = MappingProxyType(
+    {"role": "system", "content": "You are a helpful assistant."}
+)
+
+_MIME_BY_EXT = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+}
+# Pre-built data-URI prefixes so the per-image path only concatenates the
+# base64 payload.
+_DATA_URI_PREFIX_BY_EXT = {
+    ext: f"data:{mime};base64," for ext, mime in _MIME_BY_EXT.items()
+}
+
 
 class TelegramBot:
     """Telegram bot for interacting with OpenAI."""
@@ -56,7 +75,6 @@ class TelegramBot:
         """
         self.application = ApplicationBuilder().token(token).build()
         self.openai_client = openai_client
-        self.conversations: Dict[int, List[Dict[str, str]]] = {}
         self.voice_config = voice_config or VoiceProcessingConfig()
 
         # Database setup
@@ -69,7 +87,7 @@ class TelegramBot:
         )
         self.enable_web_search = enable_web_search
         # Temporary in-memory cache
-        self.conversations: Dict[int, List[Dict[str, str]]] = {}
+        self.conversations: Dict[int, Deque[Dict[str, str]]] = {}
 
         os.makedirs(
             os.path.join(os.getcwd(), self.voice_config.temp_directory), exist_ok=True
@@ -88,11 +106,9 @@ class TelegramBot:
             CommandHandler("search", self._explicit_search_command)
         )
 
-        # TEXT
+        # TEXT (filters.TEXT already excludes photos)
         self.application.add_handler(
-            MessageHandler(
-                filters.TEXT & ~filters.PHOTO & ~filters.COMMAND, self._text_handler
-            )
+            MessageHandler(filters.TEXT & ~filters.COMMAND, self._text_handler)
         )
 
         # Images
@@ -101,10 +117,11 @@ class TelegramBot:
         # Voice handler
         self.application.add_handler(MessageHandler(filters.VOICE, self._voice_handler))
 
-        # Any other file types
+        # Any other file types - negate the supported union once instead of
+        # chaining four inverted filters per update
         self.application.add_handler(
             MessageHandler(
-                ~filters.TEXT & ~filters.PHOTO & ~filters.VOICE & ~filters.COMMAND,
+                ~(filters.TEXT | filters.PHOTO | filters.VOICE | filters.COMMAND),
                 self._unsupported_message_handler,
             )
         )
@@ -130,9 +147,7 @@ class TelegramBot:
 
         # Also clear from in-memory storage if it exists
         if chat_id in self.conversations:
-            self.conversations[chat_id] = [
-                {"role": "system", "content": "You are a helpful assistant."}
-            ]
+            self.conversations[chat_id] = deque([_SYSTEM_MSG])
 
         await update.message.reply_text(
             "Conversation history has been cleared. What would you like to talk about now?"
@@ -152,7 +167,7 @@ class TelegramBot:
             # Add system message if it doesn't exist
             messages = repo.get_messages(str(chat_id))
             if not messages or not any(msg.get("role") == "system" for msg in messages):
-                repo.add_message(str(chat_id), "system", "You are a helpful assistant.")
+                repo.add_message(str(chat_id), "system", _SYSTEM_MSG["content"])
 
         if not hasattr(context, "user_data") or chat_id not in context.user_data:
             context.user_data[chat_id] = {"web_search_enabled": self.enable_web_search}
@@ -176,21 +191,16 @@ class TelegramBot:
         self, image_data: bytes, caption: str, file_path: str
     ) -> str:
         try:
-            base64_image = base64.b64encode(image_data).decode("utf-8")
-
-            mime_types = {
-                "jpg": "image/jpeg",
-                "jpeg": "image/jpeg",
-                "png": "image/png",
-                "gif": "image/gif",
-            }
-
-            file_extension = file_path.split(".")[-1].lower()
-            mime_type = mime_types.get(file_extension)
-            if not mime_type:
+            # base64 output is pure ASCII; the ascii decoder takes the fast path
+            base64_image = base64.b64encode(image_data).decode("ascii")
+
+            # rpartition avoids the intermediate list that split() builds
+            file_extension = file_path.rpartition(".")[2].lower()
+            prefix = _DATA_URI_PREFIX_BY_EXT.get(file_extension)
+            if not prefix:
                 raise ValueError(f"Unsupported image format: {file_extension}")
 
-            image_content = f"data:{mime_type};base64,{base64_image}"
+            image_content = prefix + base64_image
 
             messages = [
                 {
@@ -242,9 +252,7 @@ class TelegramBot:
         )
 
         try:
-            image_result = await asyncio.to_thread(
-                self.openai_client.generate_image, prompt
-            )
+            image_result = await self.openai_client.generate_image(prompt)
 
             if not image_result.success:
                 error_message = self._get_user_friendly_error_message(
@@ -301,10 +309,10 @@ class TelegramBot:
         chat_id = update.effective_chat.id
         user_name = update.effective_user.username if update.effective_user else None
 
-        logger.info(
-            f"Received message from chat_id={chat_id}: '{user_msg[:50]}...'"
-            if len(user_msg) > 50
-            else f"Received message from chat_id={chat_id}: '{user_msg}'"
+        logger.opt(lazy=True).info(
+            "Received message from chat_id={}: '{}'",
+            lambda: chat_id,
+            lambda: user_msg[:50] + "..." if len(user_msg) > 50 else user_msg,
         )
 
         await context.bot.send_chat_action(chat_id=chat_id, action=ChatAction.TYPING)
@@ -313,7 +321,8 @@ class TelegramBot:
             with self.database.session() as session:
                 repo = ConversationRepository(session)
                 repo.get_or_create_conversation(str(chat_id), user_name)
-                repo.add_message(str(chat_id), "user", user_msg)
+                # Buffered; committed together with the assistant reply below
+                repo.add_message(str(chat_id), "user", user_msg, commit=False)
 
                 # Get conversation history
                 messages = repo.get_messages(str(chat_id))
@@ -321,29 +330,30 @@ class TelegramBot:
                 # Apply token limit
                 trimmed_messages = self.token_manager.trim_messages_to_fit(messages)
 
-            web_search_enabled = context.user_data.get(chat_id, {}).get(
-                "web_search_enabled", self.enable_web_search
-            )
-
-            openai_result = await self.openai_client.create_chat_completion(
-                trimmed_messages, enable_web_search=web_search_enabled
-            )
-            if not openai_result.success:
-                error_message = self._get_user_friendly_error_message(
-                    openai_result.error
+                web_search_enabled = context.user_data.get(chat_id, {}).get(
+                    "web_search_enabled", self.enable_web_search
                 )
-                await update.message.reply_text(error_message)
-                return
 
-            with self.database.session() as session:
-                repo = ConversationRepository(session)
-                repo.add_message(str(chat_id), "assistant", openai_result.value)
+                openai_result = await self.openai_client.create_chat_completion(
+                    trimmed_messages, enable_web_search=web_search_enabled
+                )
+                if not openai_result.success:
+                    # Keep the failed user message out of the history
+                    session.rollback()
+                    error_message = self._get_user_friendly_error_message(
+                        openai_result.error
+                    )
+                    await update.message.reply_text(error_message)
+                    return
+
+                # One transaction covers both the user and assistant INSERTs
+                repo.add_message(
+                    str(chat_id), "assistant", openai_result.value, commit=True
+                )
 
             # Update in-memory store for compatibility with voice/image
             if chat_id not in self.conversations:
-                self.conversations[chat_id] = [
-                    {"role": "system", "content": "You are a helpful assistant."}
-                ]
+                self.conversations[chat_id] = deque([_SYSTEM_MSG])
 
             # Keep in-memory storage synchronized
             self.conversations[chat_id].append({"role": "user", "content": user_msg})
@@ -372,8 +382,10 @@ class TelegramBot:
             photo = update.message.photo[-1]  # Get highest resolution
             caption = update.message.caption or "Describe this image."
 
-            logger.info(
-                f"Received image from chat_id={chat_id} with caption: {caption}"
+            logger.opt(lazy=True).info(
+                "Received image from chat_id={} with caption: {}",
+                lambda: chat_id,
+                lambda: caption,
             )
 
             await context.bot.send_chat_action(
@@ -458,8 +470,8 @@ class TelegramBot:
                 chat_id=chat_id, action=ChatAction.TYPING
             )
 
-            transcription_result = await asyncio.to_thread(
-                self.openai_client.transcribe_audio, mp3_file_path
+            transcription_result = await self.openai_client.transcribe_audio(
+                mp3_file_path
             )
 
             if not transcription_result.success:
@@ -476,9 +488,7 @@ class TelegramBot:
             await update.message.reply_text(f'I heard: "{transcribed_text}"')
 
             if chat_id not in self.conversations:
-                self.conversations[chat_id] = [
-                    {"role": "system", "content": "You are a helpful assistant."}
-                ]
+                self.conversations[chat_id] = deque([_SYSTEM_MSG])
             self.conversations[chat_id].append(
                 {"role": "user", "content": transcribed_text}
             )
@@ -491,7 +501,7 @@ class TelegramBot:
                 "web_search_enabled", self.enable_web_search
             )
             completion_result = await self.openai_client.create_chat_completion(
-                self.conversations[chat_id], enable_web_search=web_search_enabled
+                list(self.conversations[chat_id]), enable_web_search=web_search_enabled
             )
 
             if not completion_result.success:
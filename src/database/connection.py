@@ -2,7 +2,7 @@
 import os
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from .models import Base
@@ -12,6 +12,20 @@ class Database:
     def __init__(self, db_url=None):
         self.db_url = db_url or os.getenv("DATABASE_URL", "sqlite:///conversations.db")
         self.engine = create_engine(self.db_url)
+
+        if self.db_url.startswith("sqlite"):
+            # WAL lets readers proceed while a writer commits, and NORMAL
+            # sync avoids an fsync per commit - big win for bursty
+            # add_message traffic.
+            @event.listens_for(self.engine, "connect")
+            def _sqlite_pragmas(dbapi_conn, _connection_record):
+                cursor = dbapi_conn.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                cursor.execute("PRAGMA mmap_size=268435456")
+                cursor.close()
+
         self.SessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=self.engine
         )
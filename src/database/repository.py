@@ -1,49 +1,74 @@
 # src/database/repository.py
 from typing import List, Dict, Optional, Any
 
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import Session
 
 from .models import Conversation, Message
 
 
 class ConversationRepository:
+    # Cached at class level so repeated lookups reuse one statement construct
+    # and hit SQLAlchemy's compiled-statement cache instead of re-translating
+    # a full ORM query on every add_message/get_messages call.
+    _SEL_CONV_ID = select(Conversation.id).where(
+        Conversation.chat_id == bindparam("cid")
+    )
+
     def __init__(self, session: Session):
         self.session = session
 
     def get_or_create_conversation(
         self, chat_id: str, user_id: Optional[str] = None
-    ) -> Conversation:
-        """Get an existing conversation or create a new one."""
-        conversation = (
-            self.session.query(Conversation).filter_by(chat_id=chat_id).first()
-        )
-        if not conversation:
+    ) -> int:
+        """Get the id of an existing conversation or create a new one."""
+        row = self.session.execute(self._SEL_CONV_ID, {"cid": chat_id}).first()
+        if row is None:
             conversation = Conversation(chat_id=chat_id, user_id=user_id)
             self.session.add(conversation)
             self.session.commit()
             self.session.refresh(conversation)
-        elif user_id and conversation.user_id != user_id:
-            conversation.user_id = user_id
-            self.session.commit()
-            self.session.refresh(conversation)
-        return conversation
+            return conversation.id
+
+        if user_id:
+            result = self.session.execute(
+                update(Conversation)
+                .where(
+                    Conversation.chat_id == chat_id,
+                    Conversation.user_id.is_distinct_from(user_id),
+                )
+                .values(user_id=user_id)
+            )
+            if result.rowcount:
+                self.session.commit()
+        return row[0]
 
-    def add_message(self, chat_id: str, role: str, content: str) -> Message:
-        """Add a new message to the conversation."""
-        conversation = self.get_or_create_conversation(chat_id)
-        message = Message(conversation_id=conversation.id, role=role, content=content)
+    def add_message(
+        self, chat_id: str, role: str, content: str, commit: bool = True
+    ) -> Message:
+        """Add a new message to the conversation.
+
+        With ``commit=False`` the INSERT is only flushed, letting the caller
+        batch several messages into a single transaction (one fsync on
+        sqlite instead of one per message).
+        """
+        conversation_id = self.get_or_create_conversation(chat_id)
+        message = Message(conversation_id=conversation_id, role=role, content=content)
         self.session.add(message)
-        self.session.commit()
+        if commit:
+            self.session.commit()
+        else:
+            self.session.flush()
         return message
 
     def get_messages(
         self, chat_id: str, limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Get conversation messages in OpenAI format."""
-        conversation = self.get_or_create_conversation(chat_id)
+        conversation_id = self.get_or_create_conversation(chat_id)
         query = (
             self.session.query(Message)
-            .filter_by(conversation_id=conversation.id)
+            .filter_by(conversation_id=conversation_id)
             .order_by(Message.timestamp)
         )
 
@@ -56,6 +81,6 @@ class ConversationRepository:
 
     def clear_conversation(self, chat_id: str) -> None:
         """Delete all messages in a conversation but keep the conversation record."""
-        conversation = self.get_or_create_conversation(chat_id)
-        self.session.query(Message).filter_by(conversation_id=conversation.id).delete()
+        conversation_id = self.get_or_create_conversation(chat_id)
+        self.session.query(Message).filter_by(conversation_id=conversation_id).delete()
         self.session.commit()
@@ -20,7 +20,9 @@ def configure_logging() -> None:
         "<level>{message}</level>",
         level="INFO",
         backtrace=True,
-        diagnose=True,
+        # diagnose walks the stack and serializes locals on every error - too
+        # expensive for production sinks.
+        diagnose=False,
     )
 
     logger.add(
@@ -28,6 +30,7 @@ def configure_logging() -> None:
         rotation="1 day",
         retention="2 days",
         level="INFO",
+        diagnose=False,
     )
 
 
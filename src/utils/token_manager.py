@@ -1,4 +1,5 @@
 # src/core/utils/token_manager.py
+import functools
 from typing import List, Dict
 
 import tiktoken
@@ -6,9 +7,15 @@ import tiktoken
 from core.constants import OpenAIModels
 
 
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model_name: str) -> tiktoken.Encoding:
+    """Load the BPE encoding for a model once; construction is expensive."""
+    return tiktoken.encoding_for_model(model_name)
+
+
 class TokenManager:
     def __init__(self, model_name: str = OpenAIModels.GPT_4O, max_tokens: int = 4000):
-        self.encoding = tiktoken.encoding_for_model(model_name)
+        self.encoding = _get_encoding(model_name)
         self.max_tokens = max_tokens
 
     def estimate_tokens(self, messages: List[Dict[str, str]]) -> int:
@@ -32,6 +39,11 @@ class TokenManager:
         if not messages:
             return []
 
+        # Common case: the whole history already fits the budget - skip the
+        # split/reverse/rebuild below entirely.
+        if self.estimate_tokens(messages) <= self.max_tokens:
+            return messages
+
         # Always keep system messages if requested
         system_messages = []
         if preserve_system:
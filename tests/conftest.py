@@ -1,44 +1,230 @@
-import os
+import base64
+import json
+
+import httpx
 import pytest
-import asyncio
-from unittest.mock import MagicMock, patch, AsyncMock
-from pydub import AudioSegment
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, AsyncMock
+
+from openai import AsyncOpenAI
 
 from clients.openai_client import OpenAIClient
 from clients.telegram_bot import TelegramBot
 from core.constants import OpenAIModels
+from core.result import Result
 from database.repository import ConversationRepository
 
 
+def fast_mock(cls):
+    """MagicMock tagged with a spec class but without the dir() attribute walk.
+
+    MagicMock(spec=...) reflects over every attribute of the target class on
+    each construction; the Telegram classes have large surfaces and the tests
+    only ever touch a handful of attributes, so the introspection is skipped.
+    """
+    mock = MagicMock()
+    mock._spec_class = cls
+    return mock
+
+
 @pytest.fixture
-def mock_openai_client():
-    """Create a mock OpenAI client for testing."""
-    from core.result import Result
+def make_update():
+    """Factory for the Update/Message/Chat namespaces the handlers receive.
 
-    client = MagicMock(spec=OpenAIClient)
-    client.create_chat_completion.return_value = AsyncMock(
-        return_value=Result.ok("This is a test response")
-    )
+    SimpleNamespace skips even the deferred spec bookkeeping of fast_mock;
+    the handlers only read a handful of attributes, and extras (voice,
+    photo, caption, ...) can be passed as keyword arguments.
+    """
+
+    def _make(chat_id=12345, text=None, user=None, **message_attrs):
+        message = SimpleNamespace(text=text, reply_text=AsyncMock(), **message_attrs)
+        return SimpleNamespace(
+            message=message,
+            effective_chat=SimpleNamespace(id=chat_id),
+            effective_user=user,
+        )
+
+    return _make
+
+
+@pytest.fixture
+def make_context():
+    """Factory for the handler context namespace.
+
+    Covers the bot methods the handlers call; extras (get_file, ...) can be
+    passed as keyword arguments.
+    """
+
+    def _make(**bot_attrs):
+        bot = SimpleNamespace(
+            send_message=AsyncMock(),
+            send_chat_action=AsyncMock(),
+            delete_message=AsyncMock(),
+            send_photo=AsyncMock(),
+            **bot_attrs,
+        )
+        return SimpleNamespace(bot=bot, user_data={})
+
+    return _make
+
+
+def _arm_openai_mock_defaults(client):
+    """(Re-)apply the default return values on the shared OpenAI mock."""
+    client.create_chat_completion.return_value = Result.ok("This is a test response")
     client.transcribe_audio.return_value = Result.ok("This is a test transcription")
-    client.search_web = AsyncMock(
-        return_value={"answer": "Test search result", "results": []}
-    )
-    client.config = MagicMock()
+    client.search_web.return_value = {"answer": "Test search result", "results": []}
     client.config.model = OpenAIModels.GPT_4O
+
+
+class FakeOpenAIAPI:
+    """In-memory stand-in for the OpenAI HTTP API via httpx.MockTransport.
+
+    Requests go through the real SDK (auth headers, error mapping, response
+    parsing) and are captured here; tests queue a response per path or fall
+    back to the defaults below, and inspect the sent payloads.
+    """
+
+    _DEFAULT_BODIES = {
+        "/v1/chat/completions": {
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": OpenAIModels.GPT_4O,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": "This is a test response",
+                    },
+                    "finish_reason": "stop",
+                }
+            ],
+        },
+        "/v1/images/generations": {
+            "created": 0,
+            "data": [{"url": "https://example.com/test-image.png"}],
+        },
+        "/v1/audio/transcriptions": {"text": "This is a test transcription"},
+    }
+
+    def __init__(self):
+        self.requests = []
+        self._responses = {}
+
+    def handler(self, request):
+        self.requests.append(request)
+        path = request.url.path
+        if path in self._responses:
+            return self._responses[path]
+        return httpx.Response(200, json=self._DEFAULT_BODIES[path])
+
+    def respond_with(self, path, body=None, status_code=200):
+        self._responses[path] = httpx.Response(status_code, json=body or {})
+
+    def calls(self, path):
+        return [r for r in self.requests if r.url.path == path]
+
+    def payload(self, path, index=-1):
+        return json.loads(self.calls(path)[index].content)
+
+    def reset(self):
+        self.requests.clear()
+        self._responses.clear()
+
+
+@pytest.fixture(scope="session")
+def fake_openai_api():
+    return FakeOpenAIAPI()
+
+
+@pytest.fixture(scope="session")
+def openai_client_mock(fake_openai_api):
+    """Build a real OpenAIClient once, wired to the in-memory transport.
+
+    Construction parses the pydantic config every time, so the unit-test
+    classes share this instance and reset only the captured traffic.
+    """
+    client = OpenAIClient(api_key="test_api_key")
+    client.client = AsyncOpenAI(
+        api_key="test_api_key",
+        http_client=httpx.AsyncClient(
+            transport=httpx.MockTransport(fake_openai_api.handler)
+        ),
+        max_retries=0,
+    )
     return client
 
 
-@pytest.fixture
+class _FakeOpenAIClient:
+    """Hand-rolled OpenAIClient stub covering the attributes the bot uses.
+
+    MagicMock(spec=OpenAIClient) walks the SDK-heavy class to build its
+    spec; this stub is constant-time and keeps the same mock surface.
+    """
+
+    def __init__(self):
+        self.create_chat_completion = AsyncMock()
+        self.transcribe_audio = AsyncMock()
+        self.generate_image = AsyncMock()
+        self.search_web = AsyncMock()
+        self.config = MagicMock()
+        self.tavily_manager = MagicMock()
+
+    def reset_mock(self, return_value=False, side_effect=False):
+        self.create_chat_completion.reset_mock(
+            return_value=return_value, side_effect=side_effect
+        )
+        self.transcribe_audio.reset_mock(
+            return_value=return_value, side_effect=side_effect
+        )
+        self.generate_image.reset_mock(
+            return_value=return_value, side_effect=side_effect
+        )
+        self.search_web.reset_mock(return_value=return_value, side_effect=side_effect)
+        self.config.reset_mock(return_value=return_value, side_effect=side_effect)
+        self.tavily_manager.reset_mock(
+            return_value=return_value, side_effect=side_effect
+        )
+
+
+@pytest.fixture(scope="session")
+def mock_openai_client():
+    """Create a stub OpenAI client shared across the session."""
+    client = _FakeOpenAIClient()
+    _arm_openai_mock_defaults(client)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def _reset_openai_mock(mock_openai_client):
+    """Re-arm the session-scoped OpenAI mock between tests."""
+    yield
+    mock_openai_client.reset_mock(return_value=True, side_effect=True)
+    _arm_openai_mock_defaults(mock_openai_client)
+
+
+_REPO_DEFAULT_MESSAGES = [{"role": "system", "content": "You are a helpful assistant."}]
+
+
+@pytest.fixture(scope="module")
 def mock_repository():
-    """Create a mock conversation repository for testing."""
+    """Create a mock conversation repository shared across a module."""
     repo = MagicMock(spec=ConversationRepository)
-    repo.get_messages.return_value = [
-        {"role": "system", "content": "You are a helpful assistant."}
-    ]
+    repo.get_messages.return_value = _REPO_DEFAULT_MESSAGES
     return repo
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _reset_repository_mock(mock_repository):
+    """Re-arm the module-scoped repository mock between tests."""
+    yield
+    mock_repository.reset_mock(return_value=True, side_effect=True)
+    mock_repository.get_messages.return_value = _REPO_DEFAULT_MESSAGES
+
+
+@pytest.fixture(scope="module")
 def mock_database(mock_repository):
     from database.connection import Database
 
@@ -56,43 +242,54 @@ def mock_database(mock_repository):
 
 
 @pytest.fixture(scope="function")
-def patch_conversation_repository(mock_repository):
-    with patch("clients.telegram_bot.ConversationRepository") as mock_repo_class:
-        mock_repo_class.return_value = mock_repository
-        yield mock_repo_class, mock_repository
+def patch_conversation_repository(monkeypatch, mock_repository):
+    mock_repo_class = MagicMock(return_value=mock_repository)
+    monkeypatch.setattr("clients.telegram_bot.ConversationRepository", mock_repo_class)
+    return mock_repo_class, mock_repository
 
 
-@pytest.fixture
-def voice_config():
+@pytest.fixture(scope="session")
+def voice_config(tmp_path_factory):
     """Create a voice processing configuration for testing."""
     from clients.models import VoiceProcessingConfig
 
-    return VoiceProcessingConfig(temp_directory="temp_test_audio")
+    return VoiceProcessingConfig(temp_directory=str(tmp_path_factory.mktemp("voice")))
 
 
-@pytest.fixture
-def mock_token_manager():
-    """Create a mock token manager for testing."""
-    from utils.token_manager import TokenManager
-
-    token_manager = MagicMock(spec=TokenManager)
+def _arm_token_manager_defaults(token_manager):
+    """(Re-)apply the pass-through behavior on the shared token manager mock."""
     token_manager.trim_messages_to_fit.side_effect = (
         lambda messages, preserve_system=True: messages
     )
     token_manager.estimate_tokens.return_value = 100
 
+
+@pytest.fixture(scope="session")
+def mock_token_manager():
+    """Create a mock token manager shared across the session."""
+    from utils.token_manager import TokenManager
+
+    token_manager = MagicMock(spec=TokenManager)
+    _arm_token_manager_defaults(token_manager)
     return token_manager
 
 
-@pytest.fixture
-def telegram_bot(
+@pytest.fixture(autouse=True)
+def _reset_token_manager_mock(mock_token_manager):
+    """Re-arm the session-scoped token manager mock between tests."""
+    yield
+    mock_token_manager.reset_mock(return_value=True, side_effect=True)
+    _arm_token_manager_defaults(mock_token_manager)
+
+
+@pytest.fixture(scope="module")
+def _telegram_bot_instance(
     mock_openai_client,
     voice_config,
     mock_database,
-    patch_conversation_repository,
     mock_token_manager,
 ):
-    """Create a TelegramBot instance with all mocked dependencies."""
+    """Build the TelegramBot once per module; tests reset its state instead."""
     bot = TelegramBot(
         token="test_token",
         openai_client=mock_openai_client,
@@ -102,61 +299,93 @@ def telegram_bot(
 
     bot.token_manager = mock_token_manager
 
-    os.makedirs(os.path.join(os.getcwd(), voice_config.temp_directory), exist_ok=True)
+    return bot
 
-    yield bot
 
-    # Cleanup
-    temp_dir = os.path.join(os.getcwd(), voice_config.temp_directory)
-    try:
-        if os.path.exists(temp_dir) and not os.listdir(temp_dir):
-            os.rmdir(temp_dir)
-    except:
-        pass
+@pytest.fixture
+def telegram_bot(_telegram_bot_instance, patch_conversation_repository):
+    """Hand out the shared bot and undo per-test mutations afterwards."""
+    yield _telegram_bot_instance
+    _telegram_bot_instance.conversations.clear()
+    # Tests may shadow bound methods (e.g. _process_image) on the instance
+    _telegram_bot_instance.__dict__.pop("_process_image", None)
 
 
 @pytest.fixture
-def temp_audio_directory():
-    """Create and clean up a temporary directory for audio files."""
-    test_dir = os.path.join(os.getcwd(), "temp_test_audio")
-    os.makedirs(test_dir, exist_ok=True)
+def mock_aiohttp_get(monkeypatch):
+    """Patch aiohttp.ClientSession.get with a reusable mock response.
 
-    yield test_dir
+    Tests set ``resp.status`` / ``resp.read`` as needed; monkeypatch undoes
+    the patch, which is cheaper than a unittest.mock.patch context per test.
+    """
+    from aiohttp import ClientResponse
 
-    for file in os.listdir(test_dir):
-        os.remove(os.path.join(test_dir, file))
+    resp = MagicMock(spec=ClientResponse)
+    resp.__aenter__.return_value = resp
+    monkeypatch.setattr("aiohttp.ClientSession.get", MagicMock(return_value=resp))
+    return resp
 
-    try:
-        os.rmdir(test_dir)
-    except:
-        pass
+
+# Header-only audio payload. Nothing in the suite ever decodes this file
+# (AudioSegment is always mocked), so a plausible header plus padding replaces
+# the pydub/ffmpeg export entirely.
+_SILENT_MP3_BYTES = (
+    b"ID3\x04\x00\x00\x00\x00\x00\x00" + b"\xff\xfb\x90\x00" + b"\x00" * 416
+)
 
 
 @pytest.fixture
-def sample_mp3(temp_audio_directory):
-    """Create a sample MP3 file for testing."""
-    mp3_path = os.path.join(temp_audio_directory, "sample.mp3")
+def patched_audio_segment(monkeypatch):
+    """Stub AudioSegment on the bot module so no audio is actually decoded."""
+    import clients.telegram_bot as telegram_bot_module
 
-    # Create a silent 1-second audio segment
-    AudioSegment.silent(duration=1000).export(mp3_path, format="mp3")
+    mock_audio_segment = MagicMock()
+    mock_audio_segment.from_ogg.return_value = MagicMock(export=MagicMock())
+    monkeypatch.setattr(telegram_bot_module, "AudioSegment", mock_audio_segment)
+    return mock_audio_segment
 
-    yield mp3_path
 
+_FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
-@pytest.fixture
-def sample_ogg(temp_audio_directory):
-    """Create a sample OGG file for testing."""
-    ogg_path = os.path.join(temp_audio_directory, "sample.oga")
 
-    # Create a silent 1-second audio segment
-    AudioSegment.silent(duration=1000).export(ogg_path, format="ogg")
+@pytest.fixture(scope="session")
+def test_jpg_bytes():
+    """Read the checked-in JPEG payload once for the whole session."""
+    return (_FIXTURES_DIR / "test.jpg").read_bytes()
 
-    yield ogg_path
 
+@pytest.fixture(scope="session")
+def test_jpg_data_uri(test_jpg_bytes):
+    """Expected data URI for test.jpg, encoded once per session.
 
-@pytest.fixture
-def event_loop():
-    """Create an instance of the default event loop for each test."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+    base64 output is pure ASCII, so decode("ascii") takes the fast path.
+    """
+    encoded = base64.b64encode(test_jpg_bytes).decode("ascii")
+    return f"data:image/jpeg;base64,{encoded}"
+
+
+def build_vision_messages(caption, data_uri):
+    """Build the message list _process_image is expected to send."""
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": caption},
+                {"type": "image_url", "image_url": {"url": data_uri}},
+            ],
+        }
+    ]
+
+
+@pytest.fixture(scope="session")
+def expected_vision_messages(test_jpg_data_uri):
+    """Frozen expected payload for the canonical test caption."""
+    return build_vision_messages("Describe this image", test_jpg_data_uri)
+
+
+@pytest.fixture(scope="session")
+def sample_mp3(tmp_path_factory):
+    """Create a sample MP3 file once per session (tests only read it)."""
+    mp3_path = tmp_path_factory.mktemp("audio_samples") / "sample.mp3"
+    mp3_path.write_bytes(_SILENT_MP3_BYTES)
+    return str(mp3_path)
@@ -1,15 +1,14 @@
 # tests/integration/test_conversation_flow.py
 from unittest.mock import MagicMock, AsyncMock
 
-import pytest
-from telegram import Update, Message, Chat
+from telegram import Message
 
 from core.result import Result
+from tests.conftest import fast_mock
 
 
-@pytest.mark.asyncio
 async def test_conversation_continuity_with_db(
-    telegram_bot, mock_openai_client, mock_repository
+    telegram_bot, mock_openai_client, mock_repository, make_update
 ):
     # Configure mock OpenAI client responses
     mock_openai_client.create_chat_completion.side_effect = [
@@ -23,15 +22,7 @@ async def test_conversation_continuity_with_db(
     ]
 
     # First message setup
-    mock_text_message = MagicMock(spec=Message)
-    mock_text_message.text = "Hello bot"
-    mock_text_message.reply_text = AsyncMock()
-
-    mock_text_update = MagicMock(spec=Update)
-    mock_text_update.message = mock_text_message
-    mock_text_update.effective_chat = MagicMock(spec=Chat)
-    mock_text_update.effective_chat.id = 12345
-    mock_text_update.effective_user = None
+    mock_text_update = make_update(text="Hello bot")
 
     mock_text_context = MagicMock()
     mock_text_context.bot = MagicMock()
@@ -40,23 +31,20 @@ async def test_conversation_continuity_with_db(
     await telegram_bot._text_handler(mock_text_update, mock_text_context)
 
     mock_repository.get_or_create_conversation.assert_called_with("12345", None)
-    mock_repository.add_message.assert_any_call("12345", "user", "Hello bot")
     mock_repository.add_message.assert_any_call(
-        "12345", "assistant", "Hello! How can I help you?"
+        "12345", "user", "Hello bot", commit=False
+    )
+    mock_repository.add_message.assert_any_call(
+        "12345", "assistant", "Hello! How can I help you?", commit=True
     )
-
-    # Update mock repository for second message
-    mock_repository.get_messages.return_value = [
-        {"role": "system", "content": "You are a helpful assistant."},
-        {"role": "user", "content": "Hello bot"},
-        {"role": "assistant", "content": "Hello! How can I help you?"},
-    ]
 
     # Second message (simulating voice message transcription)
     telegram_bot.conversations[12345].append(
         {"role": "user", "content": "What's the weather like?"}
     )
 
+    # Update mock repository for the second message; only this value is read
+    # by the completion call below
     mock_repository.get_messages.return_value = [
         {"role": "system", "content": "You are a helpful assistant."},
         {"role": "user", "content": "Hello bot"},
@@ -86,8 +74,7 @@ async def test_conversation_continuity_with_db(
     )
 
 
-@pytest.mark.asyncio
-async def test_search_web_functionality(telegram_bot, mock_openai_client):
+async def test_search_web_functionality(telegram_bot, mock_openai_client, make_update):
     """Test the explicit web search command functionality."""
     # Configure mock for web search
     mock_search_result = {
@@ -109,24 +96,14 @@ async def test_search_web_functionality(telegram_bot, mock_openai_client):
         ],
     }
 
-    mock_openai_client.search_web = AsyncMock(return_value=mock_search_result)
+    mock_openai_client.search_web.return_value = mock_search_result
 
-    mock_openai_client.tavily_manager = MagicMock()
-
-    mock_openai_client.create_chat_completion = AsyncMock(
-        return_value=Result.ok(
-            "Here's what I found about test query: it's a sample query used for testing."
-        )
+    mock_openai_client.create_chat_completion.return_value = Result.ok(
+        "Here's what I found about test query: it's a sample query used for testing."
     )
 
-    mock_message = MagicMock(spec=Message)
-    mock_message.text = "/search test query"
-    mock_message.reply_text = AsyncMock()
-
-    mock_update = MagicMock(spec=Update)
-    mock_update.message = mock_message
-    mock_update.effective_chat = MagicMock(spec=Chat)
-    mock_update.effective_chat.id = 12345
+    mock_update = make_update(text="/search test query")
+    mock_message = mock_update.message
 
     from telegram.ext import ContextTypes
 
@@ -135,7 +112,7 @@ async def test_search_web_functionality(telegram_bot, mock_openai_client):
     mock_context.bot.send_chat_action = AsyncMock()
     mock_context.bot.delete_message = AsyncMock()
 
-    status_message = MagicMock(spec=Message)
+    status_message = fast_mock(Message)
     status_message.message_id = 67890
     mock_message.reply_text.return_value = status_message
 
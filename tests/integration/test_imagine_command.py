@@ -1,55 +1,52 @@
 # tests/integration/test_imagine_command.py
-from unittest.mock import MagicMock, AsyncMock, patch
+from unittest.mock import MagicMock, AsyncMock
 
-import pytest
-from aiohttp import ClientResponse
 from telegram import Update, Message, Chat
 from telegram.ext import ContextTypes
 
 from core.result import ImageGenerationResult
-
-
-@pytest.mark.asyncio
-async def test_imagine_command_success(telegram_bot, mock_openai_client):
+from tests.conftest import fast_mock
+
+# Shared successful generation result; tests only read it
+_IMAGE_OK = ImageGenerationResult.ok(
+    "https://example.com/generated-image.png",
+    metadata={
+        "revised_prompt": "A cat playing the piano",
+        "model": "dall-e-3",
+        "size": "1024x1024",
+        "quality": "standard",
+    },
+)
+
+
+async def test_imagine_command_success(
+    telegram_bot, mock_openai_client, mock_aiohttp_get
+):
     """Test the successful execution of the /imagine command."""
-    # Configure mock for image generation
-    image_result = ImageGenerationResult.ok(
-        "https://example.com/generated-image.png",
-        metadata={
-            "revised_prompt": "A cat playing the piano",
-            "model": "dall-e-3",
-            "size": "1024x1024",
-            "quality": "standard",
-        },
-    )
-    mock_openai_client.generate_image.return_value = image_result
+    mock_openai_client.generate_image.return_value = _IMAGE_OK
 
-    # Mock the image download response
-    mock_response = MagicMock(spec=ClientResponse)
-    mock_response.status = 200
-    mock_response.__aenter__.return_value = mock_response
-    mock_response.read = AsyncMock(return_value=b"fake_image_data")
+    # Configure the mocked image download response
+    mock_aiohttp_get.status = 200
+    mock_aiohttp_get.read = AsyncMock(return_value=b"fake_image_data")
 
     # Mock message and update
-    mock_message = MagicMock(spec=Message)
+    mock_message = fast_mock(Message)
     mock_message.text = "/imagine A cat playing the piano"
     mock_message.reply_text = AsyncMock()
 
-    mock_update = MagicMock(spec=Update)
+    mock_update = fast_mock(Update)
     mock_update.message = mock_message
-    mock_update.effective_chat = MagicMock(spec=Chat)
+    mock_update.effective_chat = fast_mock(Chat)
     mock_update.effective_chat.id = 12345
 
     # Mock context
-    mock_context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+    mock_context = fast_mock(ContextTypes.DEFAULT_TYPE)
     mock_context.bot = MagicMock()
     mock_context.bot.send_chat_action = AsyncMock()
     mock_context.bot.delete_message = AsyncMock()
     mock_context.bot.send_photo = AsyncMock()
 
-    # Patch aiohttp session to avoid real HTTP requests
-    with patch("aiohttp.ClientSession.get", return_value=mock_response):
-        await telegram_bot._imagine_command(mock_update, mock_context)
+    await telegram_bot._imagine_command(mock_update, mock_context)
 
     # Verify the OpenAI client was called correctly
     mock_openai_client.generate_image.assert_called_once_with("A cat playing the piano")
@@ -65,19 +62,18 @@ async def test_imagine_command_success(telegram_bot, mock_openai_client):
     mock_context.bot.delete_message.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_imagine_command_empty_prompt(telegram_bot):
     """Test the /imagine command with an empty prompt."""
 
-    mock_message = MagicMock(spec=Message)
+    mock_message = fast_mock(Message)
     mock_message.text = "/imagine"  # Empty prompt
     mock_message.reply_text = AsyncMock()
 
-    mock_update = MagicMock(spec=Update)
+    mock_update = fast_mock(Update)
     mock_update.message = mock_message
 
     # Mock context
-    mock_context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+    mock_context = fast_mock(ContextTypes.DEFAULT_TYPE)
 
     await telegram_bot._imagine_command(mock_update, mock_context)
 
@@ -87,7 +83,6 @@ async def test_imagine_command_empty_prompt(telegram_bot):
     assert "Example:" in call_args
 
 
-@pytest.mark.asyncio
 async def test_imagine_command_api_error(telegram_bot, mock_openai_client):
     """Test handling of API errors during image generation."""
     from core.exceptions import APIError
@@ -97,17 +92,17 @@ async def test_imagine_command_api_error(telegram_bot, mock_openai_client):
         error=error
     )
 
-    mock_message = MagicMock(spec=Message)
+    mock_message = fast_mock(Message)
     mock_message.text = "/imagine A beautiful mountain"
     mock_message.reply_text = AsyncMock()
 
-    mock_update = MagicMock(spec=Update)
+    mock_update = fast_mock(Update)
     mock_update.message = mock_message
-    mock_update.effective_chat = MagicMock(spec=Chat)
+    mock_update.effective_chat = fast_mock(Chat)
     mock_update.effective_chat.id = 12345
 
     # Mock context
-    mock_context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+    mock_context = fast_mock(ContextTypes.DEFAULT_TYPE)
     mock_context.bot = MagicMock()
     mock_context.bot.send_chat_action = AsyncMock()
 
@@ -125,36 +120,29 @@ async def test_imagine_command_api_error(telegram_bot, mock_openai_client):
     assert "couldn't generate" in error_message.lower()
 
 
-@pytest.mark.asyncio
-async def test_imagine_command_image_download_failure(telegram_bot, mock_openai_client):
+async def test_imagine_command_image_download_failure(
+    telegram_bot, mock_openai_client, mock_aiohttp_get
+):
     """Test handling of image download failures."""
-    image_result = ImageGenerationResult.ok(
-        "https://example.com/generated-image.png",
-        metadata={"revised_prompt": "A cat playing the piano"},
-    )
-    mock_openai_client.generate_image.return_value = image_result
+    mock_openai_client.generate_image.return_value = _IMAGE_OK
 
-    mock_response = MagicMock(spec=ClientResponse)
-    mock_response.status = 404
-    mock_response.__aenter__.return_value = mock_response
+    mock_aiohttp_get.status = 404
 
-    mock_message = MagicMock(spec=Message)
+    mock_message = fast_mock(Message)
     mock_message.text = "/imagine A cat playing the piano"
     mock_message.reply_text = AsyncMock()
 
-    mock_update = MagicMock(spec=Update)
+    mock_update = fast_mock(Update)
     mock_update.message = mock_message
-    mock_update.effective_chat = MagicMock(spec=Chat)
+    mock_update.effective_chat = fast_mock(Chat)
     mock_update.effective_chat.id = 12345
 
-    mock_context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+    mock_context = fast_mock(ContextTypes.DEFAULT_TYPE)
     mock_context.bot = MagicMock()
     mock_context.bot.send_chat_action = AsyncMock()
     mock_context.bot.delete_message = AsyncMock()
 
-    # Patch aiohttp session to simulate download failure
-    with patch("aiohttp.ClientSession.get", return_value=mock_response):
-        await telegram_bot._imagine_command(mock_update, mock_context)
+    await telegram_bot._imagine_command(mock_update, mock_context)
 
     # Verify error handling
     mock_message.reply_text.assert_called()
@@ -1,34 +1,43 @@
 # tests/unit/test_image_generation.py
-from unittest.mock import MagicMock
+import pytest
 
-from clients.openai_client import OpenAIClient
 from core.constants import OpenAIModels, ImageSizes, ImageQuality
 from core.exceptions import (
     ImageGenerationError,
+    APIAuthenticationError,
+    APIRateLimitError,
     APIError,
 )
 
+_IMAGES = "/v1/images/generations"
 
-class TestImageGeneration:
-    def setup_method(self):
-        self.api_key = "test_api_key"
-        self.client = OpenAIClient(api_key=self.api_key)
-        self.client.client = MagicMock()  # Mock the internal OpenAI client
 
-    def test_generate_image_success(self):
+class TestImageGeneration:
+    @pytest.fixture(autouse=True)
+    def _bind_client(self, openai_client_mock, fake_openai_api):
+        self.client = openai_client_mock
+        self.api = fake_openai_api
+        yield
+        self.api.reset()
+
+    async def test_generate_image_success(self):
         """Test successful image generation."""
-        mock_data = MagicMock()
-        mock_data.url = "https://example.com/test-image.png"
-        mock_data.revised_prompt = "A revised test prompt"
-
-        mock_response = MagicMock()
-        mock_response.data = [mock_data]
-
-        self.client.client.images.generate.return_value = mock_response
+        self.api.respond_with(
+            _IMAGES,
+            {
+                "created": 0,
+                "data": [
+                    {
+                        "url": "https://example.com/test-image.png",
+                        "revised_prompt": "A revised test prompt",
+                    }
+                ],
+            },
+        )
 
         prompt = "A test prompt for image generation"
 
-        result = self.client.generate_image(prompt)
+        result = await self.client.generate_image(prompt)
 
         assert result.success is True
         assert result.value == "https://example.com/test-image.png"
@@ -38,98 +47,73 @@ class TestImageGeneration:
         assert result.metadata["size"] == ImageSizes.DEFAULT
         assert result.metadata["quality"] == ImageQuality.DEFAULT
 
-        self.client.client.images.generate.assert_called_once_with(
-            model=OpenAIModels.DEFAULT_IMAGE_MODEL,
-            prompt=prompt,
-            size=ImageSizes.DEFAULT,
-            quality=ImageQuality.DEFAULT,
-            n=1,
-        )
+        assert self.api.payload(_IMAGES) == {
+            "model": OpenAIModels.DEFAULT_IMAGE_MODEL,
+            "prompt": prompt,
+            "size": ImageSizes.DEFAULT,
+            "quality": ImageQuality.DEFAULT,
+            "n": 1,
+        }
 
-    def test_generate_image_empty_prompt(self):
+    async def test_generate_image_empty_prompt(self):
         """Test handling of empty prompts."""
         # Test with empty prompt
-        result = self.client.generate_image("")
+        result = await self.client.generate_image("")
 
         assert result.success is False
         assert isinstance(result.error, ImageGenerationError)
         assert "Empty or invalid prompt" in result.error_message
 
         # API should not be called
-        self.client.client.images.generate.assert_not_called()
+        assert self.api.calls(_IMAGES) == []
 
-    def test_generate_image_no_data_returned(self):
+    async def test_generate_image_no_data_returned(self):
         """Test handling when API returns no image data."""
-        # Mock empty response
-        mock_response = MagicMock()
-        mock_response.data = []
-
-        self.client.client.images.generate.return_value = mock_response
+        # Respond with no image data
+        self.api.respond_with(_IMAGES, {"created": 0, "data": []})
 
         prompt = "A test prompt for image generation"
 
-        result = self.client.generate_image(prompt)
+        result = await self.client.generate_image(prompt)
 
         assert result.success is False
         assert isinstance(result.error, ImageGenerationError)
         assert "No images generated from API" in result.error_message
 
-    def test_generate_image_authentication_error(self):
-        """Test handling of authentication errors."""
-
-        def side_effect(*args, **kwargs):
-            raise Exception("Authentication failed with OpenAI API")
-
-        self.client.client.images.generate.side_effect = side_effect
-
-        prompt = "A test prompt for image generation"
-
-        result = self.client.generate_image(prompt)
-
-        assert result.success is False
-        assert isinstance(result.error, APIError)
-        assert "error during image generation" in result.error_message
-
-    def test_generate_image_rate_limit_error(self):
-        """Test handling of rate limit errors."""
-
-        def side_effect(*args, **kwargs):
-            raise Exception("Rate limit exceeded with OpenAI API")
-
-        self.client.client.images.generate.side_effect = side_effect
-
-        prompt = "A test prompt for image generation"
-
-        result = self.client.generate_image(prompt)
-
-        assert result.success is False
-
-        assert isinstance(result.error, APIError)
-        assert "error during image generation" in result.error_message
-
-    def test_generate_image_unexpected_error(self):
-        """Test handling of unexpected errors."""
-        # Mock unexpected error
-        self.client.client.images.generate.side_effect = Exception("Unexpected error")
-
-        prompt = "A test prompt for image generation"
+    @pytest.mark.parametrize(
+        "status_code,error_cls,expected",
+        [
+            (
+                401,
+                APIAuthenticationError,
+                "Authentication failed with OpenAI image generation API",
+            ),
+            (
+                429,
+                APIRateLimitError,
+                "Rate limit exceeded with OpenAI image generation API",
+            ),
+            (500, APIError, "Unexpected error during image generation"),
+        ],
+    )
+    async def test_generate_image_api_failures(self, status_code, error_cls, expected):
+        """Test that API failures surface as the matching error results."""
+        self.api.respond_with(
+            _IMAGES, {"error": {"message": "boom"}}, status_code=status_code
+        )
 
-        result = self.client.generate_image(prompt)
+        result = await self.client.generate_image("A test prompt for image generation")
 
         assert result.success is False
-        assert isinstance(result.error, APIError)
-        assert "Unexpected error during image generation" in result.error_message
+        assert isinstance(result.error, error_cls)
+        assert expected in result.error_message
 
-    def test_generate_image_with_custom_parameters(self):
+    async def test_generate_image_with_custom_parameters(self):
         """Test image generation with custom parameters."""
-        # Mock the response
-        mock_data = MagicMock()
-        mock_data.url = "https://example.com/custom-image.png"
-
-        mock_response = MagicMock()
-        mock_response.data = [mock_data]
-
-        self.client.client.images.generate.return_value = mock_response
+        self.api.respond_with(
+            _IMAGES,
+            {"created": 0, "data": [{"url": "https://example.com/custom-image.png"}]},
+        )
 
         # Test input with custom parameters
         prompt = "A custom test prompt"
@@ -138,7 +122,7 @@ class TestImageGeneration:
         model = OpenAIModels.DALL_E_2
 
         # Call the function with custom parameters
-        result = self.client.generate_image(
+        result = await self.client.generate_image(
             prompt=prompt,
             size=size,
             quality=quality,
@@ -151,10 +135,10 @@ class TestImageGeneration:
         assert result.metadata["size"] == size
         assert result.metadata["quality"] == quality
 
-        self.client.client.images.generate.assert_called_once_with(
-            model=model,
-            prompt=prompt,
-            size=size,
-            quality=quality,
-            n=1,
-        )
+        assert self.api.payload(_IMAGES) == {
+            "model": model,
+            "prompt": prompt,
+            "size": size,
+            "quality": quality,
+            "n": 1,
+        }
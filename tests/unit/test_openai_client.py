@@ -11,12 +11,29 @@ from core.exceptions import (
     APIError,
 )
 
+_CHAT = "/v1/chat/completions"
+_TRANSCRIPTIONS = "/v1/audio/transcriptions"
+
+
+@pytest.fixture
+def fake_fs(request):
+    """Patch the filesystem size checks; parametrize with the fake file size."""
+    stat_result = MagicMock()
+    stat_result.st_size = request.param
+    with patch("os.path.exists", return_value=True), patch(
+        "pathlib.Path.stat", return_value=stat_result
+    ):
+        yield
+
 
 class TestOpenAIClient:
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _bind_client(self, openai_client_mock, fake_openai_api):
         self.api_key = "test_api_key"
-        self.client = OpenAIClient(api_key=self.api_key)
-        self.client.client = MagicMock()  # Mock the internal OpenAI client
+        self.client = openai_client_mock
+        self.api = fake_openai_api
+        yield
+        self.api.reset()
 
     def test_init(self):
         assert self.client.config.api_key == self.api_key
@@ -28,75 +45,53 @@ class TestOpenAIClient:
         with pytest.raises(ValueError, match="Missing OpenAI API key"):
             OpenAIClient(api_key="")
 
-    def test_transcribe_audio_success(self, sample_mp3):
-        # Mock the OpenAI API response
-        mock_transcription = MagicMock()
-        mock_transcription.text = "This is a test transcription"
-        self.client.client.audio.transcriptions.create.return_value = mock_transcription
-
-        result = self.client.transcribe_audio(sample_mp3)
+    async def test_transcribe_audio_success(self, sample_mp3):
+        result = await self.client.transcribe_audio(sample_mp3)
 
         assert result.success
         assert result.value == "This is a test transcription"
         assert "file_path" in result.metadata
         assert "file_size_mb" in result.metadata
-        self.client.client.audio.transcriptions.create.assert_called_once()
+        assert len(self.api.calls(_TRANSCRIPTIONS)) == 1
 
-    def test_transcribe_audio_file_not_found(self):
-        result = self.client.transcribe_audio("non_existent_file.mp3")
+    async def test_transcribe_audio_file_not_found(self):
+        result = await self.client.transcribe_audio("non_existent_file.mp3")
         assert not result.success
         assert isinstance(result.error, AudioFileNotFoundError)
         assert "Audio file not found" in result.error_message
 
-    @patch("os.path.exists")
-    @patch("pathlib.Path.stat")
-    def test_transcribe_audio_file_too_large(self, mock_stat, mock_exists):
-        # Mock file existence and size
-        mock_exists.return_value = True
-        mock_stat_result = MagicMock()
-        # Set file size to 30MB (over the 25MB limit)
-        mock_stat_result.st_size = 30 * 1024 * 1024
-        mock_stat.return_value = mock_stat_result
-
-        result = self.client.transcribe_audio("large_file.mp3")
-        assert not result.success
-        assert isinstance(result.error, AudioFileTooLargeError)
-        assert "exceeds" in result.error_message
-
-    def test_transcribe_audio_api_error(self, sample_mp3):
-        # Mock file existence
-        with patch("os.path.exists", return_value=True), patch(
-            "pathlib.Path.stat"
-        ) as mock_stat:
-
-            # Set file size to be within limits
-            mock_stat_result = MagicMock()
-            mock_stat_result.st_size = 5 * 1024 * 1024
-            mock_stat.return_value = mock_stat_result
-
-            # Simulate an API error
-            self.client.client.audio.transcriptions.create.side_effect = Exception(
-                "API Error"
+    @pytest.mark.parametrize(
+        "fake_fs,api_status,error_cls,expected",
+        [
+            # 30MB file is over the 25MB limit; the API is never reached
+            (30 * 1024 * 1024, None, AudioFileTooLargeError, "exceeds"),
+            # 5MB file passes the size check; the API answers with a 500
+            (
+                5 * 1024 * 1024,
+                500,
+                APIError,
+                "Unexpected error during transcription",
+            ),
+        ],
+        indirect=["fake_fs"],
+        ids=["file_too_large", "api_error"],
+    )
+    async def test_transcribe_audio_failures(
+        self, fake_fs, api_status, error_cls, expected, sample_mp3
+    ):
+        if api_status is not None:
+            self.api.respond_with(
+                _TRANSCRIPTIONS,
+                {"error": {"message": "API Error"}},
+                status_code=api_status,
             )
 
-            result = self.client.transcribe_audio(sample_mp3)
-            assert not result.success
-            assert isinstance(result.error, APIError)
-            assert "Unexpected error during transcription" in result.error_message
+        result = await self.client.transcribe_audio(sample_mp3)
+        assert not result.success
+        assert isinstance(result.error, error_cls)
+        assert expected in result.error_message
 
-    @pytest.mark.asyncio
     async def test_chat_completion_success(self):
-        # Mock the OpenAI API response
-        mock_choice = MagicMock()
-        mock_choice.message.content = "This is a test response"
-        mock_choice.finish_reason = "stop"
-
-        mock_completion = MagicMock()
-        mock_completion.choices = [mock_choice]
-
-        self.client.client.chat.completions.create.return_value = mock_completion
-
-        # Create test messages
         messages = [{"role": "user", "content": "Hello"}]
 
         result = await self.client.create_chat_completion(messages)
@@ -104,15 +99,24 @@ class TestOpenAIClient:
         assert result.success
         assert result.value == "This is a test response"
         assert result.metadata["finish_reason"] == "stop"
-        self.client.client.chat.completions.create.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_chat_completion_no_choices(self):
-        # Mock the OpenAI API response with no choices
-        mock_completion = MagicMock()
-        mock_completion.choices = []
+        # Verify what was actually sent over the wire
+        payload = self.api.payload(_CHAT)
+        assert payload["model"] == OpenAIModels.GPT_4O
+        assert payload["messages"] == messages
 
-        self.client.client.chat.completions.create.return_value = mock_completion
+    async def test_chat_completion_no_choices(self):
+        # Respond with no choices
+        self.api.respond_with(
+            _CHAT,
+            {
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": OpenAIModels.GPT_4O,
+                "choices": [],
+            },
+        )
 
         messages = [{"role": "user", "content": "Hello"}]
 
@@ -121,11 +125,10 @@ class TestOpenAIClient:
         assert not result.success
         assert "No choices returned" in result.error_message
 
-    @pytest.mark.asyncio
     async def test_chat_completion_authentication_error(self):
         # Simulate an authentication error
-        self.client.client.chat.completions.create.side_effect = MagicMock(
-            side_effect=Exception("Authentication Error")
+        self.api.respond_with(
+            _CHAT, {"error": {"message": "Authentication Error"}}, status_code=401
         )
 
         messages = [{"role": "user", "content": "Hello"}]
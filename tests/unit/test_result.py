@@ -1,55 +1,58 @@
 # tests/unit/test_result.py
-from core.result import Result
+import pytest
 
+from core.result import Result
 
-class TestResult:
+_ERROR = ValueError("Test error")
 
-    def test_result_ok(self):
-        """Test creating a successful result."""
-        result = Result.ok("Success value")
-        assert result.success is True
-        assert result.value == "Success value"
-        assert result.error is None
-        assert result.error_message is None
-
-    def test_result_fail(self):
-        """Test creating a failed result with an error."""
-        error = ValueError("Test error")
-        result = Result.fail(error=error)
-        assert result.success is False
-        assert result.value is None
-        assert result.error == error
-        assert result.error_message == "Test error"
-
-    def test_result_fail_with_message(self):
-        """Test creating a failed result with a custom message."""
-        result = Result.fail(error_message="Custom error message")
-        assert result.success is False
-        assert result.value is None
-        assert result.error is None
-        assert result.error_message == "Custom error message"
-
-    def test_result_bool_conversion(self):
-        """Test boolean conversion of results."""
-        success_result = Result.ok("Value")
-        failure_result = Result.fail(error_message="Error")
 
-        assert bool(success_result) is True
-        assert bool(failure_result) is False
-
-        # Test in if statement
-        if success_result:
-            success_flag = True
-        else:
-            success_flag = False
+class TestResult:
 
-        if failure_result:
-            failure_flag = True
-        else:
-            failure_flag = False
+    @pytest.mark.parametrize(
+        "result,expected",
+        [
+            (
+                Result.ok("Success value"),
+                {
+                    "success": True,
+                    "value": "Success value",
+                    "error": None,
+                    "error_message": None,
+                },
+            ),
+            (
+                Result.fail(error=_ERROR),
+                {
+                    "success": False,
+                    "value": None,
+                    "error": _ERROR,
+                    "error_message": "Test error",
+                },
+            ),
+            (
+                Result.fail(error_message="Custom error message"),
+                {
+                    "success": False,
+                    "value": None,
+                    "error": None,
+                    "error_message": "Custom error message",
+                },
+            ),
+        ],
+        ids=["ok", "fail_with_error", "fail_with_message"],
+    )
+    def test_result_shape(self, result, expected):
+        """Test the field layout of successful and failed results."""
+        assert {key: getattr(result, key) for key in expected} == expected
 
-        assert success_flag is True
-        assert failure_flag is False
+    @pytest.mark.parametrize(
+        "result,expected",
+        [(Result.ok("Value"), True), (Result.fail(error_message="Error"), False)],
+        ids=["ok", "fail"],
+    )
+    def test_result_bool_conversion(self, result, expected):
+        """Test boolean conversion of results."""
+        assert bool(result) is expected
 
     def test_result_with_metadata(self):
         """Test results with metadata."""
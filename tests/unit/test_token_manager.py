@@ -20,7 +20,8 @@ def test_token_manager_trim_messages(mock_openai_client):
         model_name=mock_openai_client.config.model, max_tokens=10
     )
 
-    token_manager.estimate_tokens = lambda msgs: sum(5 for _ in msgs)
+    # trim_messages_to_fit calls this per trim step; keep it a single C-level op
+    token_manager.estimate_tokens = lambda msgs: 5 * len(msgs)
 
     # Trim messages to fit
     trimmed_messages = token_manager.trim_messages_to_fit(messages)